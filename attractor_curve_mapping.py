@@ -6,7 +6,127 @@ How convergence curves encode information about initial conditions
 
 import numpy as np
 import matplotlib.pyplot as plt
-from collections import defaultdict
+from collections import defaultdict, namedtuple
+from numba import njit, prange
+
+# A convergence curve stored as parallel arrays, one row per time step
+Curve = namedtuple('Curve', 'positions velocities dominant')
+
+# A curve signature packed into one fixed-size record, so all stored
+# signatures can be compared at once. Curves too short to be sampled keep
+# their whole dominant sequence as the pattern, padded with -1
+PATTERN_LENGTH = 9
+SIGNATURE_DTYPE = np.dtype([
+    ('early_attractor', 'i4'),
+    ('mid_attractor', 'i4'),
+    ('final_attractor', 'i4'),
+    ('curve_length', 'i4'),
+    ('total_distance', 'f8'),
+    ('direction_changes', 'i4'),
+    ('affinity_pattern', 'i4', (PATTERN_LENGTH,)),
+])
+
+
+@njit
+def _basin_affinity(dx, dy, sig_gap):
+    """
+    Affinity of a point for one attractor
+    `dx`, `dy` point from the point to the attractor; `sig_gap` is the
+    absolute difference of their signatures
+    """
+    dist = np.sqrt(dx * dx + dy * dy)
+    compat = 1.0 / (1.0 + sig_gap)
+    return compat / (1.0 + dist * 0.01)
+
+
+@njit
+def _integrate(initial_value, attractors, attr_sig,
+               positions, velocities, dominant):
+    """
+    Integrate one trajectory in compiled code
+    Writes the history into the given buffers, one row per step, and
+    returns the number of steps actually taken
+    """
+    n_attractors = attractors.shape[0]
+    max_steps = positions.shape[0]
+    
+    # History is kept in float32; the point itself integrates in float64,
+    # since the modular signatures amplify any rounding along the way.
+    # For the same reason no kernel on this path is built with fastmath:
+    # reordered or fused arithmetic would change curves between machines
+    px = float(initial_value)
+    py = initial_value * 1.5 % 100
+    vx = 0.0
+    vy = 0.0
+    
+    n_steps = max_steps
+    for step in range(max_steps):
+        # Calculate pull from ALL attractors
+        fx = 0.0
+        fy = 0.0
+        point_sig = (px + py) % 7
+        best = 0
+        best_affinity = -1.0
+        for j in range(n_attractors):
+            dx = attractors[j, 0] - px
+            dy = attractors[j, 1] - py
+            affinity = _basin_affinity(dx, dy, abs(point_sig - attr_sig[j]))
+            fx += dx * affinity * 0.1
+            fy += dy * affinity * 0.1
+            if affinity > best_affinity:
+                best = j
+                best_affinity = affinity
+        
+        # Update dynamics
+        vx = vx * 0.8 + fx  # Damping
+        vy = vy * 0.8 + fy
+        px += vx
+        py += vy
+        
+        positions[step, 0] = px
+        positions[step, 1] = py
+        velocities[step, 0] = vx
+        velocities[step, 1] = vy
+        dominant[step] = best
+        
+        # Check convergence (speed below 0.01, compared squared)
+        if vx * vx + vy * vy < 1e-4:
+            n_steps = step + 1
+            break
+    
+    return n_steps
+
+
+@njit
+def _converge_kernel(initial_value, attractors, attr_sig, max_steps):
+    """
+    Integrate one trajectory into freshly allocated history arrays
+    Returns the recorded positions, velocities and dominant attractors,
+    trimmed to the number of steps actually taken
+    """
+    positions = np.empty((max_steps, 2), np.float32)
+    velocities = np.empty((max_steps, 2), np.float32)
+    dominant = np.empty(max_steps, np.int32)
+    
+    n_steps = _integrate(initial_value, attractors, attr_sig,
+                         positions, velocities, dominant)
+    
+    return positions[:n_steps], velocities[:n_steps], dominant[:n_steps]
+
+
+@njit(parallel=True)
+def _batch_converge_kernel(initial_values, attractors, attr_sig,
+                           out_positions, out_velocities, out_dominant,
+                           out_lengths):
+    """
+    Integrate many independent trajectories in parallel
+    Each thread only writes its own rows of the output buffers
+    """
+    for b in prange(initial_values.size):
+        out_lengths[b] = _integrate(
+            initial_values[b], attractors, attr_sig, out_positions[b],
+            out_velocities[b], out_dominant[b]
+        )
 
 class AttractorMapper:
     """
@@ -18,156 +138,180 @@ class AttractorMapper:
         Create a system with arbitrary attractors
         Not specific values - just convergence points in phase space
         """
+        # Values map to 2-D phase space points, and the kernels index both
+        # coordinates directly
+        if dimensions != 2:
+            raise ValueError(f"dimensions must be 2, got {dimensions}")
+        
         # Random attractors in phase space (could be ANY points)
-        np.random.seed(42)  # For reproducibility
-        self.attractors = np.random.rand(n_attractors, dimensions) * 100
+        self._rng = np.random.default_rng(42)  # For reproducibility
+        self.attractors = self._rng.uniform(
+            0.0, 100.0, size=(n_attractors, dimensions)
+        ).astype(np.float32)
+        # Attractors are fixed, so their "compatibility" property is too
+        self.attractor_signatures = np.mod(self.attractors.sum(axis=1), 7)
         self.convergence_curves = {}
+        # Cached signature of each stored curve, one row per stored value
+        self.signature_keys = []
+        self._signature_rows = {}
+        self._signature_buffer = np.empty(0, SIGNATURE_DTYPE)
         
-    def compute_basin_affinity(self, point, attractor):
+    def converge(self, initial_value, max_steps=100):
         """
-        How strongly does this point "belong" to this attractor's basin?
-        This emerges from the dynamics, not programmed
+        Let a value converge to its attractor
+        The PATH it takes encodes information
+        """
+        curve = Curve(*_converge_kernel(
+            float(initial_value), self.attractors,
+            self.attractor_signatures, max_steps
+        ))
+        
+        self.convergence_curves[initial_value] = curve
+        self._store_signature(initial_value, curve)
+        return curve
+    
+    def converge_batch(self, initial_values, max_steps=100):
         """
-        # Distance in phase space
-        distance = np.linalg.norm(point - attractor)
+        Let many values converge at once
+        Trajectories are independent, so they are integrated in parallel
+        """
+        values = np.asarray(initial_values, dtype=float)
+        n_values = len(values)
+        
+        # History buffers, one row block per value
+        all_positions = np.empty((n_values, max_steps, 2), np.float32)
+        all_velocities = np.empty((n_values, max_steps, 2), np.float32)
+        all_dominant = np.empty((n_values, max_steps), np.int32)
+        lengths = np.empty(n_values, np.intp)
         
-        # Some points have natural affinity for certain attractors
-        # based on their properties (not distance alone)
-        point_signature = np.sum(point) % 7  # Arbitrary property
-        attractor_signature = np.sum(attractor) % 7
+        _batch_converge_kernel(values, self.attractors,
+                               self.attractor_signatures, all_positions,
+                               all_velocities, all_dominant, lengths)
         
-        # Affinity combines distance and "compatibility"
-        compatibility = 1.0 / (1.0 + abs(point_signature - attractor_signature))
-        affinity = compatibility / (1.0 + distance * 0.01)
+        curves = []
+        for b, value in enumerate(initial_values):
+            n = lengths[b]
+            curve = Curve(all_positions[b, :n], all_velocities[b, :n],
+                          all_dominant[b, :n])
+            self.convergence_curves[value] = curve
+            self._store_signature(value, curve)
+            curves.append(curve)
         
-        return affinity
+        return curves
     
-    def converge(self, initial_value, max_steps=100):
+    @property
+    def signatures(self):
         """
-        Let a value converge to its attractor
-        The PATH it takes encodes information
+        Signatures of all stored curves, in the order of signature_keys
+        Returns a copy; the cache itself is resized and compacted in place
         """
-        # Convert to phase space point
-        point = np.array([
-            float(initial_value),
-            float(initial_value) * 1.5 % 100  # Second dimension
-        ])
-        
-        curve = []
-        velocity = np.zeros(2)
+        return self._signature_buffer[:len(self.signature_keys)].copy()
+    
+    def _store_signature(self, value, curve):
+        """Cache the signature of a stored curve, growing the buffer as needed"""
+        signature = self.extract_curve_signature(curve)
+        row = self._signature_rows.get(value)
         
-        for step in range(max_steps):
-            # Calculate pull from ALL attractors
-            total_force = np.zeros(2)
-            affinities = []
-            
-            for attractor in self.attractors:
-                # Each attractor exerts influence
-                affinity = self.compute_basin_affinity(point, attractor)
-                direction = attractor - point
-                force = direction * affinity * 0.1
-                total_force += force
-                affinities.append(affinity)
-            
-            # Update dynamics
-            velocity = velocity * 0.8 + total_force  # Damping
-            point = point + velocity
-            
-            # Record the curve
-            curve.append({
-                'position': point.copy(),
-                'velocity': velocity.copy(),
-                'dominant_attractor': np.argmax(affinities),
-                'affinity_distribution': affinities.copy()
-            })
-            
-            # Check convergence
-            if np.linalg.norm(velocity) < 0.01:
-                break
+        # Empty curves have no signature; drop any stale one for this value
+        if signature is None:
+            if row is not None:
+                n = len(self.signature_keys)
+                self._signature_buffer[row:n-1] = self._signature_buffer[row+1:n]
+                del self.signature_keys[row]
+                del self._signature_rows[value]
+                for later_value in self.signature_keys[row:]:
+                    self._signature_rows[later_value] -= 1
+            return
         
-        self.convergence_curves[initial_value] = curve
-        return curve
+        if row is None:
+            row = len(self.signature_keys)
+            if row == len(self._signature_buffer):
+                grown = np.empty(max(16, 2 * row), SIGNATURE_DTYPE)
+                grown[:row] = self._signature_buffer
+                self._signature_buffer = grown
+            self._signature_rows[value] = row
+            self.signature_keys.append(value)
+        self._signature_buffer[row] = signature
     
     def extract_curve_signature(self, curve):
         """
         Extract identifying features from the convergence curve
         This is where information is preserved
+        
+        Returns one SIGNATURE_DTYPE record, or None for an empty curve.
+        Its affinity_pattern is a fixed-size array padded with -1; the
+        unpadded tuple comes from extract_affinity_pattern
         """
-        if not curve:
+        if curve is None or len(curve.dominant) == 0:
             return None
         
+        dominant = curve.dominant
+        length = len(dominant)
+        
         # The curve shape encodes the initial value
-        signature = {
-            # Which attractor dominated at different phases
-            'early_attractor': curve[min(5, len(curve)-1)]['dominant_attractor'],
-            'mid_attractor': curve[len(curve)//2]['dominant_attractor'],
-            'final_attractor': curve[-1]['dominant_attractor'],
-            
-            # How the approach happened
-            'curve_length': len(curve),
-            'total_distance': sum(np.linalg.norm(curve[i]['velocity']) 
-                                for i in range(len(curve))),
-            
-            # Oscillation patterns
-            'direction_changes': self.count_direction_changes(curve),
-            
-            # Affinity evolution
-            'affinity_pattern': self.extract_affinity_pattern(curve)
-        }
+        signature = np.zeros((), SIGNATURE_DTYPE)
+        
+        # Which attractor dominated at different phases
+        signature['early_attractor'] = dominant[min(5, length-1)]
+        signature['mid_attractor'] = dominant[length//2]
+        signature['final_attractor'] = dominant[-1]
+        
+        # How the approach happened
+        signature['curve_length'] = length
+        signature['total_distance'] = np.linalg.norm(curve.velocities, axis=1).sum()
+        
+        # Oscillation patterns
+        signature['direction_changes'] = self.count_direction_changes(curve)
         
-        return signature
+        # Affinity evolution
+        pattern = self.extract_affinity_pattern(curve)
+        signature['affinity_pattern'] = -1
+        signature['affinity_pattern'][:len(pattern)] = pattern
+        
+        return signature[()]
     
     def count_direction_changes(self, curve):
         """Count how many times the curve changed direction"""
-        changes = 0
-        for i in range(2, len(curve)):
-            v1 = curve[i-1]['velocity']
-            v2 = curve[i]['velocity']
-            if np.dot(v1, v2) < 0:  # Opposite directions
-                changes += 1
-        return changes
+        v = curve.velocities
+        # Opposite directions between consecutive steps (from step 1 on)
+        dots = np.einsum('ij,ij->i', v[1:-1], v[2:])
+        return int((dots < 0).sum())
     
     def extract_affinity_pattern(self, curve):
         """Extract pattern of attractor preferences during convergence"""
-        if len(curve) < 10:
-            return tuple(c['dominant_attractor'] for c in curve)
+        dominant = curve.dominant
+        length = len(dominant)
+        if length < 10:
+            return tuple(dominant)
         
         # Sample at key points
-        indices = [0, len(curve)//4, len(curve)//2, 3*len(curve)//4, -1]
-        pattern = tuple(curve[min(i, len(curve)-1)]['dominant_attractor'] 
-                       for i in indices if i < len(curve))
-        return pattern
+        indices = [0, length//4, length//2, 3*length//4, -1]
+        return tuple(dominant[indices])
     
     def recover_from_curve(self, curve):
         """
         Attempt to identify original value from convergence curve
         """
-        target_signature = self.extract_curve_signature(curve)
-        if not target_signature:
+        target = self.extract_curve_signature(curve)
+        if target is None:
             return None
         
-        # Find best match
-        candidates = []
-        for original_value, stored_curve in self.convergence_curves.items():
-            stored_signature = self.extract_curve_signature(stored_curve)
-            
-            # Compare signatures
-            score = 0
-            if stored_signature['final_attractor'] == target_signature['final_attractor']:
-                score += 30
-            if stored_signature['early_attractor'] == target_signature['early_attractor']:
-                score += 20
-            if stored_signature['affinity_pattern'] == target_signature['affinity_pattern']:
-                score += 25
-            if abs(stored_signature['curve_length'] - target_signature['curve_length']) < 5:
-                score += 15
-            if stored_signature['direction_changes'] == target_signature['direction_changes']:
-                score += 10
-            
-            if score > 50:
-                candidates.append((original_value, score))
+        # Compare against every stored signature at once
+        stored = self._signature_buffer[:len(self.signature_keys)]
+        scores = (
+            30 * (stored['final_attractor'] == target['final_attractor'])
+            + 20 * (stored['early_attractor'] == target['early_attractor'])
+            + 25 * np.all(stored['affinity_pattern'] == target['affinity_pattern'],
+                          axis=1)
+            + 15 * (np.abs(stored['curve_length'] - target['curve_length']) < 5)
+            + 10 * (stored['direction_changes'] == target['direction_changes'])
+        )
+        
+        # Best matches first; the stable sort keeps ties in insertion order
+        rows = np.flatnonzero(scores > 50)
+        rows = rows[np.argsort(-scores[rows], kind='stable')]
         
-        return sorted(candidates, key=lambda x: x[1], reverse=True)
+        return [(self.signature_keys[row], int(scores[row])) for row in rows]
 
 def demonstrate_theory():
     """
@@ -187,13 +331,12 @@ def demonstrate_theory():
     
     test_values = [10, 11, 50, 51, 100, 101]
     
-    for value in test_values:
-        curve = mapper.converge(value)
+    for value, curve in zip(test_values, mapper.converge_batch(test_values)):
         signature = mapper.extract_curve_signature(curve)
         print(f"Value {value:3d}: ", end="")
         print(f"Length={signature['curve_length']:3d}, ", end="")
         print(f"Final={signature['final_attractor']}, ", end="")
-        print(f"Pattern={signature['affinity_pattern']}")
+        print(f"Pattern={mapper.extract_affinity_pattern(curve)}")
     
     # Test 2: Recovery from curves
     print("\n2. INFORMATION RECOVERY FROM CURVES")
@@ -202,8 +345,7 @@ def demonstrate_theory():
     test_recovery = [10, 50, 100, 150, 200]
     successful = 0
     
-    for value in test_recovery:
-        curve = mapper.converge(value)
+    for value, curve in zip(test_recovery, mapper.converge_batch(test_recovery)):
         candidates = mapper.recover_from_curve(curve)
         
         if candidates and candidates[0][0] == value:
@@ -232,23 +374,28 @@ def visualize_curves(mapper, values):
     """
     Show how different initial values create different curves
     """
+    # Look every curve up once, converging any missing values in one batch
+    missing = [v for v in values if v not in mapper.convergence_curves]
+    if missing:
+        mapper.converge_batch(missing)
+    curves = [mapper.convergence_curves[v] for v in values]
+    colors = plt.cm.viridis(np.linspace(0, 1, len(values)))
+    
     fig, axes = plt.subplots(1, 3, figsize=(15, 5))
     
     # Plot 1: Convergence in phase space
     ax = axes[0]
-    colors = plt.cm.viridis(np.linspace(0, 1, len(values)))
-    
-    for i, value in enumerate(values):
-        curve = mapper.convergence_curves.get(value, mapper.converge(value))
-        positions = np.array([c['position'] for c in curve])
-        ax.plot(positions[:, 0], positions[:, 1], color=colors[i], 
+    for value, curve, color in zip(values, curves, colors):
+        positions = curve.positions
+        ax.plot(positions[:, 0], positions[:, 1], color=color, 
                 alpha=0.7, label=f'Value {value}')
-        ax.scatter(positions[-1, 0], positions[-1, 1], color=colors[i], s=50, marker='o')
+        ax.scatter(positions[-1, 0], positions[-1, 1], color=color, s=50, marker='o')
     
     # Plot attractors
-    for j, attractor in enumerate(mapper.attractors):
-        ax.scatter(attractor[0], attractor[1], s=200, marker='*', 
-                  color='red', edgecolor='black', linewidth=2, zorder=5)
+    attractors = mapper.attractors
+    ax.scatter(attractors[:, 0], attractors[:, 1], s=200, marker='*', 
+               color='red', edgecolor='black', linewidth=2, zorder=5)
+    for j, attractor in enumerate(attractors):
         ax.text(attractor[0], attractor[1]-5, f'A{j}', ha='center')
     
     ax.set_xlabel('Dimension 1')
@@ -259,10 +406,9 @@ def visualize_curves(mapper, values):
     
     # Plot 2: Velocity profiles
     ax = axes[1]
-    for i, value in enumerate(values):
-        curve = mapper.convergence_curves[value]
-        velocities = [np.linalg.norm(c['velocity']) for c in curve]
-        ax.plot(velocities, color=colors[i], alpha=0.7, label=f'Value {value}')
+    for value, curve, color in zip(values, curves, colors):
+        velocities = np.linalg.norm(curve.velocities, axis=1)
+        ax.plot(velocities, color=color, alpha=0.7, label=f'Value {value}')
     
     ax.set_xlabel('Time Step')
     ax.set_ylabel('Velocity Magnitude')
@@ -272,11 +418,10 @@ def visualize_curves(mapper, values):
     
     # Plot 3: Attractor influence over time
     ax = axes[2]
-    value = values[0]  # Show one example
-    curve = mapper.convergence_curves[value]
+    value, curve = values[0], curves[0]  # Show one example
     
     # Extract dominant attractor at each step
-    dominant = [c['dominant_attractor'] for c in curve]
+    dominant = curve.dominant
     ax.plot(dominant, 'o-', alpha=0.7)
     ax.set_xlabel('Time Step')
     ax.set_ylabel('Dominant Attractor')